@@ -1,14 +1,30 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware 
 from typing import List, Optional
-from lead_match import evaluate_product_relevancy, evaluate_multiple_leads
+from lead_match import (
+    evaluate_product_relevancy,
+    evaluate_multiple_leads,
+    iter_multiple_leads,
+    submit_batch_evaluation,
+    get_batch_evaluation,
+    wait_for_batch_evaluation,
+    open_http_session,
+    close_http_session,
+    close_openai_client,
+    warmup,
+    WORKERS,
+)
+import score_cache
+import orjson
 import uvicorn
 
 app = FastAPI(
     title="Lead Match API",
     description="API for evaluating product-lead matching scores",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -19,6 +35,23 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+@app.on_event("startup")
+async def startup():
+    """
+    Open the shared HTTP session used for model calls and warm up the connections
+    """
+    await open_http_session()
+    await warmup()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """
+    Close the shared HTTP session and connection pools
+    """
+    await close_http_session()
+    await close_openai_client()
+    await score_cache.close()
+
 class LeadInfo(BaseModel):
     name: str
     lead_id: int
@@ -47,6 +80,11 @@ class LeadScore(BaseModel):
 class MultipleLeadsResponse(BaseModel):
     results: List[LeadScore]
 
+class BatchEvaluationResponse(BaseModel):
+    batch_id: str
+    status: str
+    results: Optional[List[LeadScore]] = None
+
 @app.post("/evaluate-single", response_model=SingleLeadResponse)
 async def evaluate_single_lead(product: ProductDetails, lead: LeadInfo):
     """
@@ -54,7 +92,7 @@ async def evaluate_single_lead(product: ProductDetails, lead: LeadInfo):
     Returns a score between 0 and 10.
     """
     try:
-        score = evaluate_product_relevancy(product.details, lead.dict())
+        score = await evaluate_product_relevancy(product.details, lead.model_dump())
         return SingleLeadResponse(
             lead_id=lead.lead_id,
             relevance_score=score,
@@ -70,11 +108,54 @@ async def evaluate_multiple_leads_endpoint(request: MultipleLeadsRequest):
     Returns scores for each lead between 0 and 10.
     """
     try:
-        results = evaluate_multiple_leads(request.product_details, [lead.dict() for lead in request.leads])
+        results = await evaluate_multiple_leads(request.product_details, [lead.model_dump() for lead in request.leads])
         return MultipleLeadsResponse(results=results)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/evaluate-multiple-stream")
+async def evaluate_multiple_leads_stream_endpoint(request: MultipleLeadsRequest):
+    """
+    Evaluate the relevancy of a product for multiple leads, streaming each score as soon as it is ready.
+    Returns newline-delimited JSON, one {"lead_id", "relevance_score"} object per lead, in completion order.
+    """
+    async def _stream():
+        async for result in iter_multiple_leads(request.product_details, [lead.model_dump() for lead in request.leads]):
+            yield orjson.dumps(result) + b"\n"
+
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
+
+@app.post("/evaluate-multiple-batch", response_model=BatchEvaluationResponse)
+async def evaluate_multiple_leads_batch_endpoint(request: MultipleLeadsRequest, wait: bool = False):
+    """
+    Evaluate the relevancy of a product for multiple leads through the OpenAI Batch API.
+    Returns the batch id to poll, or the scores once the batch completes when wait is true.
+    """
+    try:
+        evaluation = await submit_batch_evaluation(request.product_details, [lead.model_dump() for lead in request.leads])
+    except ValueError as e:
+        # Empty leads or duplicate lead_ids, kept apart from the polling below so its errors stay 500s
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    try:
+        if wait:
+            evaluation = await wait_for_batch_evaluation(evaluation['batch_id'])
+        return BatchEvaluationResponse(**evaluation)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/evaluate-multiple-batch/{batch_id}", response_model=BatchEvaluationResponse)
+async def get_batch_evaluation_endpoint(batch_id: str):
+    """
+    Get the status of a batch evaluation, including the scores once it has completed.
+    """
+    try:
+        return BatchEvaluationResponse(**await get_batch_evaluation(batch_id))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/health")
 async def health_check():
     """
@@ -83,4 +164,11 @@ async def health_check():
     return {"status": "healthy"}
 
 if __name__ == "__main__":
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=WORKERS,
+        loop="uvloop",
+        http="httptools",
+    ) 
\ No newline at end of file
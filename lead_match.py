@@ -1,14 +1,426 @@
 from dotenv import load_dotenv
 import os
-from typing import List
-from langchain_openai import ChatOpenAI
-import time
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from openai import RateLimitError, APIError
-import json
+from typing import Dict, List, Optional, Tuple, Callable, Awaitable, AsyncIterator
+import asyncio
+import hashlib
+import random
+import re
+import aiohttp
+import httpx
+from openai import AsyncOpenAI
+import orjson
+from semantic_cache import SemanticCache, SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_TTL
+from rate_limiter import RateLimiter
+from prefilter import Prefilter
+import score_cache
 
 
-def evaluate_product_relevancy(product_details: str, lead_info: dict) -> float:
+# Load environment variables once at import time
+load_dotenv()
+
+# Ensure the API key is set
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+if not OPENAI_API_KEY:
+    raise ValueError("OPENAI_API_KEY is not set in the environment variables.")
+
+# Model settings shared by every scoring request
+MODEL_NAME = "gpt-4o-mini"
+TEMPERATURE = 0.3  # Lower temperature for more consistent results
+MAX_TOKENS = 10  # Limit response size
+
+# Structured output schema, so every response is a parseable {"score": number}
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "relevancy_score",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {"score": {"type": "number"}},
+            "required": ["score"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# Structured output schema for prompts scoring several leads at once
+MULTI_LEAD_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "relevancy_scores",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "scores": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "lead": {"type": "integer"},
+                            "score": {"type": "number"},
+                        },
+                        "required": ["lead", "score"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["scores"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# Response size budget per lead in a multi-lead prompt
+MAX_TOKENS_PER_LEAD = 20
+
+# OpenAI chat completions endpoint, called directly over aiohttp
+CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+# Shared aiohttp session, opened and closed with the FastAPI app
+_session: Optional[aiohttp.ClientSession] = None
+_session_lock = asyncio.Lock()
+
+# Shared async OpenAI client used for embedding lead profiles and the Batch API. It runs
+# on a single HTTP/2 connection pool reused by every call, closed with the FastAPI app.
+CLIENT = AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    http_client=httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+        timeout=30.0,
+    ),
+)
+
+# Embedding model used by the semantic cache
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Maximum number of inputs accepted by a single embeddings request
+EMBEDDING_BATCH_SIZE = 2048
+
+# Scores of previously evaluated leads, reused for near-identical profiles
+SEMANTIC_CACHE = SemanticCache(
+    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", SEMANTIC_CACHE_THRESHOLD)),
+    ttl=float(os.getenv("SEMANTIC_CACHE_TTL", SEMANTIC_CACHE_TTL)),
+)
+
+# Share exact-match scores across workers and restarts when Redis is configured
+if os.getenv("REDIS_URL"):
+    score_cache.connect_redis(os.environ["REDIS_URL"])
+
+# Scores clearly mismatched leads locally, skipping the LLM call. Opt-in: only enabled
+# when PREFILTER_THRESHOLD is set (e.g. 0.15, tuned against known-good scores).
+PREFILTER: Optional[Prefilter] = (
+    Prefilter(threshold=float(os.environ["PREFILTER_THRESHOLD"])) if os.getenv("PREFILTER_THRESHOLD") else None
+)
+
+# Number of server worker processes. Each worker has its own rate limiter, so set this
+# to the actual worker count (uvicorn and gunicorn both read it) to keep the split right.
+WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "4")))
+
+# Paces model calls to stay under the account's request and token rate limits.
+# OPENAI_RPM / OPENAI_TPM are account-wide and divided evenly between the workers.
+RATE_LIMITER = RateLimiter(
+    requests_per_minute=max(1, int(os.getenv("OPENAI_RPM", "500")) // WORKERS),
+    tokens_per_minute=max(1, int(os.getenv("OPENAI_TPM", "200000")) // WORKERS),
+)
+
+# Maximum number of model calls in flight in evaluate_multiple_leads
+MAX_CONCURRENCY = 10
+
+# Number of leads scored together in a single model call by evaluate_multiple_leads
+LEADS_PER_PROMPT = 20
+
+# Seconds between status checks when waiting for a Batch API job
+BATCH_POLL_INTERVAL = 30
+
+
+# Evaluation criteria and score scale shared by the single and multi-lead prompts
+SCORING_RUBRIC = """
+Evaluate the match between the product and the lead's profile. Consider:
+1. How well the product aligns with their current role and responsibilities
+2. Whether their skills and experience make them a good fit for this product
+3. If their industry/domain matches the product's target market
+4. Their level of seniority and decision-making authority (If they are a new employee or intern, they may not be the decision-maker. Keep the score low for them)
+
+The relevancy score is a number between 0 and 10 (with one decimal place), where:
+- 0-3: Poor match
+- 4-6: Moderate match
+- 7-8: Good match
+- 9-10: Excellent match
+"""
+
+# Static rubric sent as the system message. The product is the same for every lead of a
+# request, so all calls share this prefix and can hit OpenAI's server-side prompt cache.
+SYSTEM_PROMPT = """
+Analyze the relevancy of the following product for the LinkedIn lead provided by the user. Consider the company they work for (Use your knowledge base to analyse the company and whether it is a good fit for the product), their experience and background.
+
+Product Details:
+```{product_details}```
+""" + SCORING_RUBRIC + """
+Return ONLY a JSON object whose "score" is the relevancy score.
+
+Example response: {{"score": 7.5}}
+"""
+
+# First number in a model response, sign included so negative scores clamp to 0
+_SCORE_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+# Per-lead user message
+USER_PROMPT = "Lead Information:\n```{lead_json}```"
+
+# System message scoring several leads in a single call
+MULTI_LEAD_SYSTEM_PROMPT = """
+Analyze the relevancy of the following product for each of the LinkedIn leads provided by the user. Consider the company each lead works for (Use your knowledge base to analyse the company and whether it is a good fit for the product), their experience and background. Score every lead independently.
+
+Product Details:
+```{product_details}```
+""" + SCORING_RUBRIC + """
+Return ONLY a JSON object whose "scores" array holds exactly one entry per lead, with the lead's number in the list and its relevancy score.
+
+Example response: {{"scores": [{{"lead": 1, "score": 7.5}}, {{"lead": 2, "score": 3.0}}]}}
+"""
+
+
+def _build_messages(system_prompt: str, lead_info: dict) -> List[dict]:
+    """
+    Builds the chat messages scoring a single lead.
+    
+    Args:
+        system_prompt (str): SYSTEM_PROMPT formatted with the product details
+        lead_info (dict): Dictionary containing lead information
+    
+    Returns:
+        List[dict]: The system and user messages
+    """
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": USER_PROMPT.format(lead_json=orjson.dumps(lead_info).decode())},
+    ]
+
+
+def _build_multi_lead_messages(system_prompt: str, leads_data: List[dict]) -> List[dict]:
+    """
+    Builds the chat messages scoring several leads in a single call.
+    
+    Args:
+        system_prompt (str): MULTI_LEAD_SYSTEM_PROMPT formatted with the product details
+        leads_data (List[dict]): List of dictionaries containing lead information
+    
+    Returns:
+        List[dict]: The system and user messages
+    """
+    leads = "\n".join(f"{i}. ```{orjson.dumps(lead).decode()}```" for i, lead in enumerate(leads_data, start=1))
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Leads:\n{leads}"},
+    ]
+
+
+def _parse_score(content: str) -> float:
+    """
+    Extracts the first number of the model response as a score clamped between 0 and 10.
+    Tolerates wrappers around the number, such as the JSON object, "7.5/10" or truncated output.
+    """
+    match = _SCORE_RE.search(content)
+    score = float(match.group()) if match else 0.0
+    # Ensure the score is between 0 and 10
+    return max(0.0, min(10.0, score))
+
+
+def _parse_scores(content: str) -> Dict[int, float]:
+    """
+    Parses a multi-lead model response into scores clamped between 0 and 10, keyed by the
+    1-based position of the lead in the prompt (lead_id isn't guaranteed to be unique).
+    """
+    return {
+        int(entry["lead"]): max(0.0, min(10.0, float(entry["score"])))
+        for entry in orjson.loads(content)["scores"]
+    }
+
+
+def _product_key(product_details: str) -> str:
+    """
+    Returns a hash identifying the product, used to partition the semantic cache.
+    """
+    return hashlib.sha256(product_details.encode("utf-8")).hexdigest()
+
+
+def _lead_profile_text(lead_info: dict) -> str:
+    """
+    Builds the canonical lead representation embedded for the semantic cache.
+    """
+    return f"{lead_info.get('company', '')}|{lead_info.get('company_industry', '')}|{lead_info.get('experience', '')}"
+
+
+async def _embed_many(texts: List[str]) -> List[List[float]]:
+    """
+    Returns the embedding vectors of several texts, in the same order, using one
+    embeddings request per EMBEDDING_BATCH_SIZE texts.
+    """
+    async def _embed_batch(batch: List[str]) -> List[List[float]]:
+        response = await CLIENT.embeddings.create(model=EMBEDDING_MODEL, input=batch)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    batches = await asyncio.gather(*[
+        _embed_batch(texts[i:i + EMBEDDING_BATCH_SIZE]) for i in range(0, len(texts), EMBEDDING_BATCH_SIZE)
+    ])
+    return [vector for batch in batches for vector in batch]
+
+
+async def _embed(text: str) -> List[float]:
+    """
+    Returns the embedding vector of a piece of text.
+    """
+    return (await _embed_many([text]))[0]
+
+
+class ChatCompletionError(Exception):
+    """
+    Raised when the chat completions endpoint returns a non-success status.
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Chat completion failed with status {status}: {message}")
+        self.status = status
+
+
+async def open_http_session() -> None:
+    """
+    Opens the shared aiohttp session used for chat completions.
+    """
+    global _session
+    # Concurrent first calls to chat() must not each create (and leak) a session
+    async with _session_lock:
+        if _session is None or _session.closed:
+            _session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=100, keepalive_timeout=60),
+                headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
+                timeout=aiohttp.ClientTimeout(total=30),
+                json_serialize=lambda obj: orjson.dumps(obj).decode(),
+            )
+
+
+async def close_http_session() -> None:
+    """
+    Closes the shared aiohttp session.
+    """
+    global _session
+    async with _session_lock:
+        if _session is not None:
+            await _session.close()
+            _session = None
+
+
+async def close_openai_client() -> None:
+    """
+    Closes the connection pool of the shared OpenAI client.
+    """
+    await CLIENT.close()
+
+
+def _build_chat_payload(messages: List[dict], response_format: Optional[dict] = RESPONSE_FORMAT, max_tokens: int = MAX_TOKENS) -> dict:
+    """
+    Builds the chat completions request body for a list of messages.
+    """
+    payload = {
+        "model": MODEL_NAME,
+        "messages": messages,
+        "temperature": TEMPERATURE,
+        "max_tokens": max_tokens,
+    }
+    if response_format is not None:
+        payload["response_format"] = response_format
+    return payload
+
+
+async def chat(messages: List[dict], response_format: Optional[dict] = RESPONSE_FORMAT, max_tokens: int = MAX_TOKENS) -> str:
+    """
+    Sends messages to the chat completions endpoint and returns the response text.
+    """
+    # Open the session lazily when running outside of the FastAPI app
+    if _session is None or _session.closed:
+        await open_http_session()
+
+    async with _session.post(CHAT_COMPLETIONS_URL, json=_build_chat_payload(messages, response_format, max_tokens)) as response:
+        if response.status != 200:
+            raise ChatCompletionError(response.status, await response.text())
+        data = await response.json(loads=orjson.loads)
+
+    return data["choices"][0]["message"]["content"]
+
+
+def _is_retryable(e: BaseException) -> bool:
+    """
+    Returns whether a chat completion failure is transient (rate limit, server or network error).
+    """
+    if isinstance(e, ChatCompletionError):
+        return e.status == 429 or e.status >= 500
+    return isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+async def _with_retry(coro_fn: Callable[[], Awaitable], max_attempts: int = 4):
+    """
+    Awaits coro_fn(), retrying transient failures with jittered exponential backoff.
+    Delays start around 100ms and are capped at 8s; the jitter keeps concurrent
+    retries from hitting the rate limit again all at once.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return await coro_fn()
+        except Exception as e:
+            if not _is_retryable(e) or attempt == max_attempts - 1:
+                raise
+            delay = min(8.0, 0.1 * 2 ** attempt) * random.uniform(0.5, 1.5)
+            print(f"Transient error, retrying in {delay:.2f}s... Error: {str(e)}")
+            await asyncio.sleep(delay)
+
+
+async def _ainvoke_model(messages: List[dict], response_format: dict = RESPONSE_FORMAT, max_tokens: int = MAX_TOKENS) -> str:
+    """
+    Sends messages to the model asynchronously with rate limiting and retry logic.
+    """
+    async def _attempt() -> str:
+        # Rough token estimate (~4 characters per token) plus the completion budget
+        await RATE_LIMITER.acquire(sum(len(m["content"]) for m in messages) // 4 + max_tokens)
+        return await chat(messages, response_format, max_tokens)
+
+    return await _with_retry(_attempt)
+
+
+async def _prefilter_scores(product_details: str, leads_data: List[dict]) -> List[Optional[float]]:
+    """
+    Returns local scores for clearly mismatched leads and None for the others.
+    If the prefilter is disabled or fails, every lead is left for the LLM.
+    """
+    if PREFILTER is None:
+        return [None] * len(leads_data)
+    try:
+        return await PREFILTER.score(product_details, leads_data)
+    except Exception as e:
+        print(f"Prefilter failed: {str(e)}")
+        return [None] * len(leads_data)
+
+
+async def warmup() -> None:
+    """
+    Sends one minimal chat completion and one embedding request so DNS resolution and
+    the TLS handshakes of both connection pools happen at startup, not on the first lead.
+    Also loads the local prefilter model, if the prefilter is enabled.
+    """
+    tasks = [
+        chat([{"role": "user", "content": "ping"}], response_format=None, max_tokens=1),
+        _embed("ping"),
+    ]
+    if PREFILTER is not None:
+        tasks.append(asyncio.to_thread(PREFILTER.load))
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"Warmup request failed: {str(result)}")
+
+
+async def evaluate_product_relevancy(product_details: str, lead_info: dict) -> float:
     """
     Evaluates the relevancy of a product for a specific lead based on their LinkedIn profile.
     
@@ -28,83 +440,189 @@ def evaluate_product_relevancy(product_details: str, lead_info: dict) -> float:
     Returns:
         float: A score between 0 and 10 indicating the relevancy of the product for this lead
     """
-    # Load environment variables
-    load_dotenv()
+    # Return immediately if this exact product/lead pair was already scored
+    cache_key = score_cache.make_key(product_details, lead_info)
+    cached_score = await score_cache.get_score(cache_key)
+    if cached_score is not None:
+        return cached_score
 
-    # Ensure the API key is set
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY is not set in the environment variables.")
+    # Score the lead locally if it is clearly not a fit
+    local_score = (await _prefilter_scores(product_details, [lead_info]))[0]
+    if local_score is not None:
+        return local_score
 
-    # Initialize the OpenAI model with optimized settings
-    model = ChatOpenAI(
-        model="gpt-4o-mini",
-        openai_api_key=api_key,
-        temperature=0.3,  # Lower temperature for more consistent results
-        max_tokens=10,  # Limit response size
-    )
+    # Reuse the score of a near-identical lead if one was already evaluated
+    product_key = _product_key(product_details)
+    try:
+        vector = await _embed(_lead_profile_text(lead_info))
+        cached_score = await SEMANTIC_CACHE.lookup(product_key, vector)
+        if cached_score is not None:
+            await score_cache.set_score(cache_key, cached_score)
+            return cached_score
+    except Exception as e:
+        print(f"Semantic cache lookup failed: {str(e)}")
+        vector = None
 
     # Construct the prompt
-    prompt = f"""
-    Analyze the relevancy of the following product for this LinkedIn lead. Consider the company they work for (Use your knowledge base to analyse the company and whether it is a good fit for the product), their experience and background.
-    
-    Product Details:
-    ```{product_details}```
-    
-    Lead Information:
-    ```{lead_info}```
-    
-    Evaluate the match between the product and the lead's profile. Consider:
-    1. How well the product aligns with their current role and responsibilities
-    2. Whether their skills and experience make them a good fit for this product
-    3. If their industry/domain matches the product's target market
-    4. Their level of seniority and decision-making authority (If they are a new employee or intern, they may not be the decision-maker. Keep the score low for them)
-    
-    Return ONLY a single number between 0 and 10 (with one decimal place) representing the relevancy score, where:
-    - 0-3: Poor match
-    - 4-6: Moderate match
-    - 7-8: Good match
-    - 9-10: Excellent match
-    
-    Example response: 7.5
+    messages = _build_messages(SYSTEM_PROMPT.format(product_details=product_details), lead_info)
+
+    try:
+        # Invoke the model with rate limiting and retry logic
+        score = _parse_score(await _ainvoke_model(messages))
+    except Exception as e:
+        print(f"Failed to evaluate product relevancy: {str(e)}")
+        return 0.0  # Return 0 on any error
+
+    await score_cache.set_score(cache_key, score)
+    if vector is not None:
+        await SEMANTIC_CACHE.insert(product_key, vector, score)
+    return score
+
+
+async def _iter_scores(
+    product_details: str,
+    leads_data: List[dict],
+    max_concurrency: int,
+    leads_per_prompt: int,
+) -> AsyncIterator[Tuple[int, float]]:
     """
+    Yields (index in leads_data, score) pairs as soon as each lead's score is known.
+    Cached and prefiltered leads come first, then each chunk of model-scored leads as it completes.
+    """
+    # Limit the number of in-flight model calls
+    sem = asyncio.Semaphore(max_concurrency)
+    product_key = _product_key(product_details)
+    system_prompt = SYSTEM_PROMPT.format(product_details=product_details)
+    multi_lead_system_prompt = MULTI_LEAD_SYSTEM_PROMPT.format(product_details=product_details)
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=30),
-        retry=retry_if_exception_type((RateLimitError, APIError)),
-        after=lambda retry_state: time.sleep(2)  # Additional delay between retries
-    )
-    def _invoke_model():
+    scores: List[Optional[float]] = [None] * len(leads_data)
+    cache_keys = [score_cache.make_key(product_details, lead) for lead in leads_data]
+    vectors: List[Optional[List[float]]] = [None] * len(leads_data)
+
+    async def _remember(i: int) -> None:
+        await score_cache.set_score(cache_keys[i], scores[i])
+        if vectors[i] is not None:
+            await SEMANTIC_CACHE.insert(product_key, vectors[i], scores[i])
+
+    async def _score_lead(i: int) -> float:
+        async with sem:
+            messages = _build_messages(system_prompt, leads_data[i])
+            return _parse_score(await _ainvoke_model(messages))
+
+    async def _score_chunk(indices: List[int]) -> List[int]:
         try:
-            result = model.invoke(prompt)
-            return result
-        except (RateLimitError, APIError) as e:
-            print(f"Rate limit hit, retrying after delay... Error: {str(e)}")
-            raise
+            async with sem:
+                messages = _build_multi_lead_messages(multi_lead_system_prompt, [leads_data[i] for i in indices])
+                content = await _ainvoke_model(
+                    messages,
+                    response_format=MULTI_LEAD_RESPONSE_FORMAT,
+                    max_tokens=MAX_TOKENS_PER_LEAD * len(indices),
+                )
         except Exception as e:
-            print(f"Error invoking model: {str(e)}")
-            raise
+            for i in indices:
+                print(f"Error processing lead {leads_data[i].get('name', 'Unknown')}: {str(e)}")
+                scores[i] = 0.0
+            return indices
 
-    try:
-        # Invoke the model with retry logic
-        result = _invoke_model()
-        
-        # Extract the score from the response
         try:
-            score = float(result.content.strip())
-            # Ensure the score is between 0 and 10
-            return max(0, min(10, score))
-        except ValueError:
-            return 0.0  # Return 0 if we can't parse the score
-    except Exception as e:
-        print(f"Failed to evaluate product relevancy: {str(e)}")
-        return 0.0  # Return 0 on any error
+            chunk_scores = _parse_scores(content)
+        except Exception as e:
+            print(f"Failed to parse scores for {len(indices)} leads, scoring them individually: {str(e)}")
+            chunk_scores = {}
+
+        # Score the leads the model skipped (all of them if the response was unusable) on their own
+        positions = {i: position for position, i in enumerate(indices, start=1)}
+        missing = [i for i in indices if positions[i] not in chunk_scores]
+        fallback_scores = await asyncio.gather(*[_score_lead(i) for i in missing], return_exceptions=True)
+        fallback = dict(zip(missing, fallback_scores))
+
+        for i in indices:
+            score = fallback[i] if i in fallback else chunk_scores[positions[i]]
+            if isinstance(score, Exception):
+                print(f"Error processing lead {leads_data[i].get('name', 'Unknown')}: {str(score)}")
+                scores[i] = 0.0
+                continue
+            scores[i] = score
+            await _remember(i)
+        return indices
+
+    # Return immediately for exact product/lead pairs that were already scored
+    scores[:] = await score_cache.get_scores(cache_keys)
+    for i, score in enumerate(scores):
+        if score is not None:
+            yield i, score
+
+    # Score clearly mismatched leads locally, without an LLM call
+    pending = [i for i, score in enumerate(scores) if score is None]
+    local_scores = await _prefilter_scores(product_details, [leads_data[i] for i in pending])
+    for i, score in zip(pending, local_scores):
+        scores[i] = score
+        if score is not None:
+            yield i, score
+
+    # Reuse the scores of near-identical leads that were already evaluated,
+    # embedding all remaining leads in a single request
+    pending = [i for i, score in enumerate(scores) if score is None]
+    if pending:
+        try:
+            embedded = await _embed_many([_lead_profile_text(leads_data[i]) for i in pending])
+            for i, vector in zip(pending, embedded):
+                vectors[i] = vector
+                scores[i] = await SEMANTIC_CACHE.lookup(product_key, vector)
+                if scores[i] is not None:
+                    await score_cache.set_score(cache_keys[i], scores[i])
+                    yield i, scores[i]
+        except Exception as e:
+            print(f"Semantic cache lookup failed: {str(e)}")
+
+    # Score the remaining leads in chunks, all chunks concurrently
+    misses = [i for i, score in enumerate(scores) if score is None]
+    chunks = [misses[j:j + leads_per_prompt] for j in range(0, len(misses), leads_per_prompt)]
+    for chunk in asyncio.as_completed([_score_chunk(chunk) for chunk in chunks]):
+        for i in await chunk:
+            yield i, scores[i]
 
 
-def evaluate_multiple_leads(product_details: str, leads_data: List[dict]) -> List[dict]:
+async def iter_multiple_leads(
+    product_details: str,
+    leads_data: List[dict],
+    max_concurrency: int = MAX_CONCURRENCY,
+    leads_per_prompt: int = LEADS_PER_PROMPT,
+) -> AsyncIterator[dict]:
+    """
+    Evaluates product relevancy for multiple leads, yielding each lead's result as soon as it is known.
+    Results are yielded in completion order, not in the order of leads_data.
+    
+    Args:
+        product_details (str): Detailed description of the product
+        leads_data (List[dict]): List of dictionaries containing lead information (see evaluate_multiple_leads)
+        max_concurrency (int): Maximum number of model calls in flight at the same time
+        leads_per_prompt (int): Maximum number of leads scored in a single model call
+    
+    Yields:
+        dict: Dictionary containing:
+            {
+                'lead_id': int,
+                'relevance_score': float
+            }
+    """
+    async for i, score in _iter_scores(product_details, leads_data, max_concurrency, leads_per_prompt):
+        yield {
+            'lead_id': leads_data[i].get('lead_id', 0),
+            'relevance_score': score
+        }
+
+
+async def evaluate_multiple_leads(
+    product_details: str,
+    leads_data: List[dict],
+    max_concurrency: int = MAX_CONCURRENCY,
+    leads_per_prompt: int = LEADS_PER_PROMPT,
+) -> List[dict]:
     """
     Evaluates product relevancy for multiple leads and returns their lead_ids and scores.
+    Leads that are neither cached nor clearly mismatched are scored in groups of leads_per_prompt per model call,
+    with the groups evaluated concurrently.
     
     Args:
         product_details (str): Detailed description of the product
@@ -118,44 +636,146 @@ def evaluate_multiple_leads(product_details: str, leads_data: List[dict]) -> Lis
                 'company_overview': str,
                 'company_industry': str
             }
+        max_concurrency (int): Maximum number of model calls in flight at the same time
+        leads_per_prompt (int): Maximum number of leads scored in a single model call
     
     Returns:
-        List[dict]: List of dictionaries containing:
+        List[dict]: List of dictionaries, in the same order as leads_data, containing:
             {
                 'lead_id': int,
                 'relevance_score': float
             }
     """
-    # Initialize list to store results
+    scores: List[Optional[float]] = [None] * len(leads_data)
+    async for i, score in _iter_scores(product_details, leads_data, max_concurrency, leads_per_prompt):
+        scores[i] = score
+
+    # Build the results, preserving lead order
     results = []
-    
-    # Process each lead with delay between evaluations
-    for i, lead in enumerate(leads_data):
-        try:
-            # Evaluate product relevancy for this lead
-            score = evaluate_product_relevancy(product_details, lead)
-            
-            # Add result to list
-            results.append({
-                'lead_id': lead['lead_id'],
-                'relevance_score': score
-            })
-            
-            # Add delay between evaluations to avoid rate limits
-            if i < len(leads_data) - 1:  # Don't delay after the last lead
-                time.sleep(2)  # 2-second delay between evaluations
-                
-        except Exception as e:
-            print(f"Error processing lead {lead.get('name', 'Unknown')}: {str(e)}")
-            results.append({
-                'lead_id': lead.get('lead_id', 0),
-                'relevance_score': 0.0
-            })
+    for lead, score in zip(leads_data, scores):
+        results.append({
+            'lead_id': lead.get('lead_id', 0),
+            'relevance_score': score
+        })
     
     # Return the results
     return results
 
 
+def _build_batch_file(product_details: str, leads_data: List[dict]) -> bytes:
+    """
+    Builds the Batch API input file, one chat completion request per lead.
+    """
+    system_prompt = SYSTEM_PROMPT.format(product_details=product_details)
+    lines = []
+    for lead in leads_data:
+        lines.append(orjson.dumps({
+            "custom_id": str(lead['lead_id']),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": _build_chat_payload(_build_messages(system_prompt, lead)),
+        }))
+    return b"\n".join(lines)
+
+
+async def submit_batch_evaluation(product_details: str, leads_data: List[dict]) -> dict:
+    """
+    Submits the evaluation of multiple leads as an OpenAI Batch API job.
+    Batch jobs cost half as much and use a separate rate-limit pool, at the expense of latency.
+    
+    Args:
+        product_details (str): Detailed description of the product
+        leads_data (List[dict]): List of dictionaries containing lead information (see evaluate_multiple_leads)
+    
+    Returns:
+        dict: Dictionary in the format returned by get_batch_evaluation, without results
+    
+    Raises:
+        ValueError: If leads_data is empty or contains duplicate lead_ids
+    """
+    # Results are mapped back to leads through custom_id, which the Batch API requires to be unique
+    lead_ids = [lead['lead_id'] for lead in leads_data]
+    if not lead_ids:
+        raise ValueError("At least one lead is required")
+    if len(set(lead_ids)) != len(lead_ids):
+        raise ValueError("lead_id values must be unique")
+
+    input_file = await CLIENT.files.create(
+        file=("leads.jsonl", _build_batch_file(product_details, leads_data)),
+        purpose="batch",
+    )
+    batch = await CLIENT.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    return {'batch_id': batch.id, 'status': batch.status, 'results': None}
+
+
+async def get_batch_evaluation(batch_id: str) -> dict:
+    """
+    Returns the status of a batch job and, once it has completed or expired, the lead scores.
+    Every submitted lead gets a result, in submission order; leads whose request failed or
+    never ran (in an expired batch) are scored 0.0.
+    
+    Args:
+        batch_id (str): The id returned by submit_batch_evaluation
+    
+    Returns:
+        dict: Dictionary containing:
+            {
+                'batch_id': str,
+                'status': str,
+                'results': Optional[List[dict]]  # [{'lead_id': int, 'relevance_score': float}, ...]
+            }
+    """
+    batch = await CLIENT.batches.retrieve(batch_id)
+    if batch.status not in ("completed", "expired"):
+        return {'batch_id': batch_id, 'status': batch.status, 'results': None}
+
+    async def _read_lines(file_id: Optional[str]) -> List[str]:
+        if not file_id:
+            return []
+        content = await CLIENT.files.content(file_id)
+        return [line for line in content.text.splitlines() if line.strip()]
+
+    # Successful requests land in the output file, failed ones in the error file, and either may be missing
+    input_lines, output_lines, error_lines = await asyncio.gather(
+        _read_lines(batch.input_file_id),
+        _read_lines(batch.output_file_id),
+        _read_lines(batch.error_file_id),
+    )
+
+    custom_ids = [orjson.loads(line)['custom_id'] for line in input_lines]
+    scores = dict.fromkeys(custom_ids, 0.0)
+    for line in output_lines + error_lines:
+        record = orjson.loads(line)
+        response = record.get('response') or {}
+        try:
+            if record.get('error') or response.get('status_code') != 200:
+                raise ValueError(record.get('error') or response)
+            scores[record['custom_id']] = _parse_score(response['body']['choices'][0]['message']['content'])
+        except (ValueError, KeyError, IndexError) as e:
+            # One failed request shouldn't discard the rest of the batch
+            print(f"Error processing lead {record.get('custom_id')}: {str(e)}")
+
+    results = [
+        {'lead_id': int(custom_id), 'relevance_score': scores[custom_id]}
+        for custom_id in custom_ids
+    ]
+    return {'batch_id': batch_id, 'status': batch.status, 'results': results}
+
+
+async def wait_for_batch_evaluation(batch_id: str, poll_interval: float = BATCH_POLL_INTERVAL) -> dict:
+    """
+    Polls a batch job until it reaches a terminal status and returns get_batch_evaluation's result.
+    """
+    while True:
+        evaluation = await get_batch_evaluation(batch_id)
+        if evaluation['status'] in ("completed", "failed", "expired", "cancelled"):
+            return evaluation
+        await asyncio.sleep(poll_interval)
+
 
 # product_details = """
 # AI-Powered Sales Automation Platform
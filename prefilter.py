@@ -0,0 +1,80 @@
+import asyncio
+import threading
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+# Local embedding model used to spot clearly mismatched leads (small and fast on CPU)
+PREFILTER_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class Prefilter:
+    """
+    Scores obviously poor product/lead matches locally so they skip the LLM call.
+
+    The product and lead profiles are embedded with a local sentence-transformers
+    model; leads whose cosine similarity to the product is below `threshold` get a
+    score of `similarity * 10`, all others are left for the LLM.
+    """
+
+    def __init__(self, threshold: float, model_name: str = PREFILTER_MODEL_NAME):
+        self.model_name = model_name
+        self.threshold = threshold
+        self._model: Optional["SentenceTransformer"] = None
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def load(self) -> bool:
+        """
+        Loads the embedding model, if it isn't loaded yet. A failed load is remembered
+        and not retried, so the prefilter stays disabled instead of re-downloading per request.
+
+        Returns:
+            bool: Whether the model is available
+        """
+        with self._lock:
+            if self._model is None and not self._failed:
+                try:
+                    # Imported here so torch is only loaded when the prefilter is enabled
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(self.model_name, device="cpu")
+                except Exception as e:
+                    self._failed = True
+                    print(f"Prefilter disabled, failed to load {self.model_name}: {str(e)}")
+            return self._model is not None
+
+    @staticmethod
+    def _lead_text(lead_info: dict) -> str:
+        return f"{lead_info.get('experience', '')} {lead_info.get('company_industry', '')} {lead_info.get('company_overview', '')}"
+
+    def _score(self, product_details: str, leads_data: List[dict]) -> List[Optional[float]]:
+        if not self.load():
+            return [None] * len(leads_data)
+        # Embed the product once, together with every lead, in a single batch
+        embeddings = self._model.encode(
+            [product_details] + [self._lead_text(lead) for lead in leads_data],
+            normalize_embeddings=True,
+        )
+        similarities = embeddings[1:] @ embeddings[0]
+        return [
+            max(0.0, float(similarity) * 10) if similarity < self.threshold else None
+            for similarity in similarities
+        ]
+
+    async def score(self, product_details: str, leads_data: List[dict]) -> List[Optional[float]]:
+        """
+        Returns a local score for each clearly mismatched lead, and None for leads that need the LLM.
+
+        Args:
+            product_details (str): Detailed description of the product
+            leads_data (List[dict]): List of dictionaries containing lead information
+
+        Returns:
+            List[Optional[float]]: One entry per lead, in the same order as leads_data
+        """
+        if not leads_data:
+            return []
+        # Encoding is CPU-bound, keep it off the event loop
+        return await asyncio.to_thread(self._score, product_details, leads_data)
@@ -0,0 +1,58 @@
+import time
+import asyncio
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter pacing both requests and tokens per minute.
+
+    Both buckets start full and refill continuously at their per-minute rate,
+    so short bursts go through immediately while sustained load is spread out.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_request_capacity = float(requests_per_minute)
+        self.available_token_capacity = float(tokens_per_minute)
+        self._last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_update
+        self._last_update = now
+        self.available_request_capacity = min(
+            self.requests_per_minute,
+            self.available_request_capacity + elapsed * self.requests_per_minute / 60,
+        )
+        self.available_token_capacity = min(
+            self.tokens_per_minute,
+            self.available_token_capacity + elapsed * self.tokens_per_minute / 60,
+        )
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Waits until one request and `tokens` tokens are available, then consumes them.
+
+        Args:
+            tokens (int): Estimated number of tokens (prompt + completion) used by the request
+        """
+        # A request can never need more than a full bucket
+        tokens = min(tokens, self.tokens_per_minute)
+
+        # Callers are served in arrival order
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.available_request_capacity >= 1 and self.available_token_capacity >= tokens:
+                    self.available_request_capacity -= 1
+                    self.available_token_capacity -= tokens
+                    return
+
+                # Sleep until both buckets have refilled enough
+                wait = max(
+                    (1 - self.available_request_capacity) * 60 / self.requests_per_minute,
+                    (tokens - self.available_token_capacity) * 60 / self.tokens_per_minute,
+                )
+                await asyncio.sleep(wait)
@@ -0,0 +1,112 @@
+import orjson
+import struct
+import hashlib
+import threading
+from typing import List, Optional
+from cachetools import TTLCache
+import redis.asyncio as redis
+
+
+# Maximum number of exact-match scores kept in memory
+SCORE_CACHE_MAXSIZE = 10_000
+
+# Number of seconds an exact-match score stays valid in memory
+SCORE_CACHE_TTL = 86400
+
+# Number of seconds an exact-match score stays valid in Redis
+REDIS_TTL = 7 * 86400
+
+# In-process L1 cache
+_cache = TTLCache(maxsize=SCORE_CACHE_MAXSIZE, ttl=SCORE_CACHE_TTL)
+_lock = threading.Lock()
+
+# Optional Redis L2 cache, shared across workers and surviving restarts
+_redis: Optional[redis.Redis] = None
+
+
+def connect_redis(url: str) -> None:
+    """
+    Enables the Redis L2 cache.
+
+    Args:
+        url (str): Redis connection URL, e.g. redis://localhost:6379/0
+    """
+    global _redis
+    _redis = redis.from_url(url)
+
+
+async def close() -> None:
+    """
+    Closes the Redis connection pool, if any.
+    """
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def make_key(product_details: str, lead_info: dict) -> str:
+    """
+    Builds the cache key of a product/lead pair from its normalized content.
+
+    Args:
+        product_details (str): Detailed description of the product
+        lead_info (dict): Dictionary containing lead information
+
+    Returns:
+        str: Hex digest identifying the pair
+    """
+    normalized = orjson.dumps(lead_info, option=orjson.OPT_SORT_KEYS) + product_details.encode("utf-8")
+    return hashlib.blake2b(normalized, digest_size=16).hexdigest()
+
+
+def _redis_key(key: str) -> str:
+    return f"score:{key}"
+
+
+async def get_scores(keys: List[str]) -> List[Optional[float]]:
+    """
+    Returns the cached score of each key, or None where it is missing or expired.
+    Keys missing from memory are looked up in Redis with a single MGET and copied back into memory.
+    """
+    with _lock:
+        scores = [_cache.get(key) for key in keys]
+
+    missing = [i for i, score in enumerate(scores) if score is None]
+    if _redis is None or not missing:
+        return scores
+
+    try:
+        values = await _redis.mget([_redis_key(keys[i]) for i in missing])
+    except Exception as e:
+        print(f"Redis lookup failed: {str(e)}")
+        return scores
+
+    with _lock:
+        for i, value in zip(missing, values):
+            if value is not None:
+                # Scores are stored as 32-bit floats, round off the conversion noise
+                scores[i] = round(struct.unpack("f", value)[0], 4)
+                _cache[keys[i]] = scores[i]
+    return scores
+
+
+async def get_score(key: str) -> Optional[float]:
+    """
+    Returns the cached score for a key, or None if it is missing or expired.
+    """
+    return (await get_scores([key]))[0]
+
+
+async def set_score(key: str, score: float) -> None:
+    """
+    Stores the score for a key in memory and, if enabled, in Redis.
+    """
+    with _lock:
+        _cache[key] = score
+
+    if _redis is not None:
+        try:
+            await _redis.set(_redis_key(key), struct.pack("f", score), ex=REDIS_TTL)
+        except Exception as e:
+            print(f"Redis write failed: {str(e)}")
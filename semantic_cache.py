@@ -0,0 +1,152 @@
+import time
+import asyncio
+from collections import OrderedDict
+from typing import List, Optional
+import numpy as np
+import faiss
+
+
+# Default minimum cosine similarity for a cached score to be reused
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+# Default number of seconds a cached score stays valid
+SEMANTIC_CACHE_TTL = 86400
+
+# Dimension of the text-embedding-3-small vectors
+EMBEDDING_DIMENSIONS = 1536
+
+# Default maximum number of entries kept per product
+SEMANTIC_CACHE_MAX_ENTRIES = 10_000
+
+# Default maximum number of products kept; the least recently written one is dropped first
+SEMANTIC_CACHE_MAX_PRODUCTS = 100
+
+# Number of nearest neighbours inspected per lookup, so expired entries don't hide fresh ones
+_SEARCH_K = 4
+
+# Similarity above which a new entry overwrites an existing one instead of adding a duplicate
+_DUPLICATE_SIMILARITY = 0.999
+
+# Fraction of expired entries in a product's index that triggers a rebuild
+_EXPIRED_FRACTION = 0.25
+
+
+class SemanticCache:
+    """
+    In-process cache of relevancy scores keyed on lead profile embeddings.
+
+    Each product gets its own FAISS inner-product index over normalized vectors, so
+    a lookup only ever matches leads previously scored against the same product.
+    Re-scoring a profile overwrites its entry, and a product's index is rebuilt
+    without its expired or oldest entries once they pile up, so memory and lookup
+    time stay bounded.
+    """
+
+    def __init__(
+        self,
+        dimensions: int = EMBEDDING_DIMENSIONS,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        ttl: float = SEMANTIC_CACHE_TTL,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+        max_products: int = SEMANTIC_CACHE_MAX_PRODUCTS,
+    ):
+        self.dimensions = dimensions
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_products = max_products
+        # product_key -> {'index': IndexFlatIP, 'vectors': [...], 'scores': [...], 'timestamps': [...]}
+        self._partitions: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    def _normalize(self, vector: List[float]) -> np.ndarray:
+        vec = np.asarray(vector, dtype="float32").reshape(1, self.dimensions)
+        faiss.normalize_L2(vec)
+        return vec
+
+    async def lookup(self, product_key: str, vector: List[float]) -> Optional[float]:
+        """
+        Returns the cached score of the most similar lead for this product, or None on a miss.
+
+        Args:
+            product_key (str): Hash identifying the product the lead is scored against
+            vector (List[float]): Embedding of the lead profile
+
+        Returns:
+            Optional[float]: The cached score if a fresh entry is at least `threshold` similar
+        """
+        partition = self._partitions.get(product_key)
+        if partition is None or partition['index'].ntotal == 0:
+            return None
+
+        index = partition['index']
+        sims, ids = index.search(self._normalize(vector), min(_SEARCH_K, index.ntotal))
+        now = time.time()
+        for sim, idx in zip(sims[0], ids[0]):
+            if sim < self.threshold:
+                break
+            if now - partition['timestamps'][idx] <= self.ttl:
+                return partition['scores'][idx]
+        return None
+
+    async def insert(self, product_key: str, vector: List[float], score: float) -> None:
+        """
+        Stores the score of a freshly evaluated lead.
+
+        Args:
+            product_key (str): Hash identifying the product the lead was scored against
+            vector (List[float]): Embedding of the lead profile
+            score (float): Relevancy score returned by the model
+        """
+        async with self._lock:
+            vec = self._normalize(vector)
+            now = time.time()
+
+            partition = self._partitions.get(product_key)
+            if partition is None:
+                partition = self._partitions[product_key] = {
+                    'index': faiss.IndexFlatIP(self.dimensions),
+                    'vectors': [],
+                    'scores': [],
+                    'timestamps': [],
+                }
+                if len(self._partitions) > self.max_products:
+                    self._partitions.popitem(last=False)
+            else:
+                self._partitions.move_to_end(product_key)
+
+            # Overwrite the entry of an already cached profile instead of duplicating it
+            index = partition['index']
+            if index.ntotal:
+                sims, ids = index.search(vec, 1)
+                if sims[0][0] >= _DUPLICATE_SIMILARITY:
+                    idx = ids[0][0]
+                    partition['scores'][idx] = score
+                    partition['timestamps'][idx] = now
+                    return
+
+            index.add(vec)
+            partition['vectors'].append(vec[0])
+            partition['scores'].append(score)
+            partition['timestamps'].append(now)
+
+            expired = sum(1 for timestamp in partition['timestamps'] if now - timestamp > self.ttl)
+            if expired > _EXPIRED_FRACTION * index.ntotal or index.ntotal > self.max_entries:
+                self._rebuild(partition, now)
+
+    def _rebuild(self, partition: dict, now: float) -> None:
+        """
+        Rebuilds a product's index without its expired entries, keeping at most 90% of
+        max_entries (newest first) so the rebuild isn't repeated on every insert.
+        """
+        fresh = [i for i, timestamp in enumerate(partition['timestamps']) if now - timestamp <= self.ttl]
+        fresh.sort(key=lambda i: partition['timestamps'][i], reverse=True)
+        keep = sorted(fresh[:int(self.max_entries * 0.9) or 1])
+
+        index = faiss.IndexFlatIP(self.dimensions)
+        if keep:
+            index.add(np.vstack([partition['vectors'][i] for i in keep]))
+        partition['index'] = index
+        partition['vectors'] = [partition['vectors'][i] for i in keep]
+        partition['scores'] = [partition['scores'][i] for i in keep]
+        partition['timestamps'] = [partition['timestamps'][i] for i in keep]